@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 """
-Weather Console (Flask + Discord Webhook + PWA-ready UI)
+Weather Console (Quart + Discord Webhook + PWA-ready UI)
 - /ui : app-like web UI (PC/iPhone) -> POST /webhook
 - /webhook : accepts {"from": "...", "message": "..."} and returns JSON {"reply_text": "..."}
 - Posts the same reply to Discord if DISCORD_WEBHOOK_URL is set.
+- Async (ASGI): outbound HTTP goes through one shared httpx.AsyncClient (HTTP/2),
+  so concurrent webhook requests overlap on a single event loop.
 
 Env:
   OPENWEATHER_API_KEY=...
@@ -12,33 +14,49 @@ Env:
 """
 import os
 import re
-import json
+import gzip
+import hashlib
+import asyncio
+import weakref
+import logging
+import logging.handlers
+import queue
 from datetime import datetime
 from typing import Dict, Tuple, Optional, List
 
-import requests
-from flask import Flask, request, jsonify, Response, send_from_directory
+import httpx
+import orjson
+from cachetools import TTLCache
+from quart import Quart, request, Response, send_from_directory, redirect
 
-app = Flask(__name__)
+try:  # optional: serve /ui brotli-compressed when available
+    import brotli
+except ImportError:
+    brotli = None
 
-
-
-from flask import redirect
+# ./static next to this script is served by Quart's built-in static route
+# (resolved once here; app.static_folder re-joins the path on every access)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+app = Quart(__name__, static_folder=STATIC_DIR, static_url_path="/static")
+# icons rarely change: let browsers keep static files (see _static_cache for exceptions)
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 31536000
 
 @app.get("/")
-def root():
+async def root():
     # Nice-to-have: base URL shows the app instead of 404
     return redirect("/ui", code=302)
 
+# The UI links /static/icons/icon-192.png as its icon; /favicon.ico is only for
+# browsers that probe it anyway. Checked once at startup instead of per request.
+HAS_FAVICON = os.path.isfile(os.path.join(STATIC_DIR, "favicon.ico"))
+
 @app.get("/favicon.ico")
-def favicon():
+async def favicon():
     # Avoid noisy 404s in logs (optional)
-    from flask import send_from_directory
     # If you don't have a favicon, just return 204
-    try:
-        return send_from_directory(app.static_folder, "favicon.ico")
-    except Exception:
+    if not HAS_FAVICON:
         return ("", 204)
+    return await send_from_directory(STATIC_DIR, "favicon.ico")
 # ----------------------------
 # Config
 # ----------------------------
@@ -51,6 +69,8 @@ CITY_CHIPS = [
     "横浜", "東京", "箱根", "白馬", "志賀高原", "ガーラ湯沢", "千曲", "船橋", "幕張", "福岡",
     "栂池", "みなとみらい", "保土ヶ谷", "平塚",
 ]
+# O(1) membership; the list above keeps chip order for the UI and the token scan
+CITY_CHIPS_SET = frozenset(CITY_CHIPS)
 
 # Aliases for places that OpenWeather may not resolve well with Japanese query
 # Value is a geocoding query string (we'll append ",JP" unless already has country)
@@ -71,24 +91,150 @@ CITY_ALIASES: Dict[str, str] = {
     "平塚": "Hiratsuka",
 }
 
+# ----------------------------
+# Logging (request path only enqueues; a background thread writes to stderr)
+# ----------------------------
+log = logging.getLogger("webhook")
+log.setLevel(logging.INFO)
+log.propagate = False
+_LOG_QUEUE: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+log.addHandler(logging.handlers.QueueHandler(_LOG_QUEUE))
+_LOG_HANDLER = logging.StreamHandler()
+_LOG_HANDLER.setFormatter(logging.Formatter("[%(name)s] %(message)s"))
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _LOG_HANDLER)
+
+@app.before_serving
+async def _start_logging():
+    _LOG_LISTENER.start()
+
+@app.after_serving
+async def _stop_logging():
+    _LOG_LISTENER.stop()  # flushes what's still queued
+
+# ----------------------------
+# HTTP client (shared, created on startup)
+# ----------------------------
+HTTP_TIMEOUT = 10.0
+CLIENT: Optional[httpx.AsyncClient] = None
+
+# retry transient upstream failures (5xx / dropped connection) a couple of times
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.2
+RETRY_STATUSES = (500, 502, 503, 504)
+
+@app.before_serving
+async def _open_client():
+    global CLIENT
+    # HTTP/2: parallel calls to the same host multiplex on one warm TLS connection
+    CLIENT = httpx.AsyncClient(
+        http2=True,
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60),
+    )
+
+@app.after_serving
+async def _close_client():
+    if CLIENT is not None:
+        await CLIENT.aclose()
+
+async def _get_json(url: str, params: dict):
+    """GET url -> parsed JSON, or None on a non-200 reply."""
+    for attempt in range(RETRY_TOTAL + 1):
+        last = attempt == RETRY_TOTAL
+        try:
+            r = await CLIENT.get(url, params=params)
+            if r.status_code == 200:
+                return orjson.loads(r.content)
+            if r.status_code not in RETRY_STATUSES or last:
+                return None
+        except (httpx.NetworkError, httpx.RemoteProtocolError):
+            if last:
+                raise
+        await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+    return None
+
+# ----------------------------
+# Caches
+# ----------------------------
+# city (alias-resolved) -> (resolved_name, lat, lon, region); places don't move
+GEO_CACHE: TTLCache = TTLCache(maxsize=512, ttl=86400)
+# One Call (current + daily); OpenWeather refreshes current obs ~every 10 min
+ONECALL_CACHE: TTLCache = TTLCache(maxsize=256, ttl=300)
+# one lock per in-flight key so concurrent misses collapse into one upstream call
+_FETCH_LOCKS: "weakref.WeakValueDictionary[tuple, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+async def _cached(cache: TTLCache, key: tuple, fetch):
+    """Return cache[key], or await fetch() once and store a non-empty result."""
+    if key in cache:
+        return cache[key]
+    lock = _FETCH_LOCKS.get(key)
+    if lock is None:
+        lock = _FETCH_LOCKS[key] = asyncio.Lock()
+    async with lock:
+        if key in cache:
+            return cache[key]
+        val = await fetch()
+        if val:
+            cache[key] = val
+        return val
+
 # ----------------------------
 # Helpers
 # ----------------------------
-def post_to_discord(text: str) -> bool:
+async def post_to_discord(text: str) -> bool:
     if not DISCORD_WEBHOOK_URL:
         return False
     try:
-        r = requests.post(DISCORD_WEBHOOK_URL, json={"content": text}, timeout=10)
+        r = await CLIENT.post(
+            DISCORD_WEBHOOK_URL,
+            content=orjson.dumps({"content": text}),
+            headers={"Content-Type": "application/json"},
+        )
         return 200 <= r.status_code < 300
     except Exception:
         return False
 
+def queue_discord(text: str):
+    """
+    Post text to Discord in the background so the UI reply doesn't wait on it.
+    Returns the sent_to_discord value for the reply: "queued" or False (no webhook).
+    """
+    if not DISCORD_WEBHOOK_URL:
+        return False
+    app.add_background_task(post_to_discord, text)
+    return "queued"
+
+# intent keywords (order matters) -> (intent, key removed when extracting a free-form city)
+INTENT_KEYWORDS: List[Tuple[Tuple[str, ...], str, str]] = [
+    (("週間天気", "週刊天気", "予報"), "forecast", "週間天気"),
+    # "雨" alone is too broad; we still treat as umbrella advice
+    (("傘", "雨"), "umbrella", "傘"),
+    (("寒さ", "寒い"), "cold", "寒さ"),
+    (("服装",), "outfit", "服装"),
+    (("天気",), "weather", "天気"),
+]
+
+def _build_tokens() -> Dict[str, Tuple[bool, int, object]]:
+    # token -> (is_city, priority rank, (intent, key) | city)
+    tokens: Dict[str, Tuple[bool, int, object]] = {}
+    for rank, (words, intent, key) in enumerate(INTENT_KEYWORDS):
+        for w in words:
+            tokens[w] = (False, rank, (intent, key))
+    for rank, c in enumerate(CITY_CHIPS):
+        tokens.setdefault(c, (True, rank, c))
+    return tokens
+
+_TOKENS = _build_tokens()
+# longest first so e.g. "週間天気" wins over "天気" at the same position
+_TOKEN_RE = re.compile("|".join(re.escape(t) for t in sorted(_TOKENS, key=len, reverse=True)))
+
+# remove (full/half-width) spaces to allow "東京天気" etc
+_WS_TABLE = str.maketrans({"\u3000": None, " ": None})
+# filler words left around a free-form city name
+_CITY_FILLER_RE = re.compile("今日の|今日|の")
+
 def _norm(s: str) -> str:
-    s = (s or "").strip()
-    s = s.replace("　", " ")
-    # remove spaces to allow "東京天気" etc
-    s = s.replace(" ", "")
-    return s
+    return (s or "").strip().translate(_WS_TABLE)
 
 def parse_command(raw: str) -> Tuple[str, str, str]:
     """
@@ -100,38 +246,27 @@ def parse_command(raw: str) -> Tuple[str, str, str]:
     if not msg:
         return ("raw", "", "raw")
 
-    # intent keywords (order matters)
-    if "週間天気" in msg or "週刊天気" in msg or "予報" in msg:
-        intent = "forecast"; key = "週間天気"
-    elif "傘" in msg or "雨" in msg:
-        # "雨" alone is too broad; we still treat as umbrella advice
-        intent = "umbrella"; key = "傘"
-    elif "寒さ" in msg or "寒い" in msg:
-        intent = "cold"; key = "寒さ"
-    elif "服装" in msg:
-        intent = "outfit"; key = "服装"
-    elif "天気" in msg:
-        intent = "weather"; key = "天気"
-    else:
+    # One scan over msg: pick the highest-priority intent and the first-listed chip
+    intent = key = None
+    city = ""
+    irank = crank = len(_TOKENS)
+    for m in _TOKEN_RE.finditer(msg):
+        is_city, rank, payload = _TOKENS[m.group()]
+        if is_city:
+            if rank < crank:
+                crank, city = rank, payload
+        elif rank < irank:
+            irank, (intent, key) = rank, payload
+
+    if intent is None:
         # If message is exactly a city chip (e.g., "東京"), default to weather
-        if msg in CITY_CHIPS:
+        if msg in CITY_CHIPS_SET:
             return ("weather", msg, "today")
         return ("raw", msg, "raw")
 
-    # Extract city:
-    # Try known chips first (works for "東京天気" "天気東京" "東京週間天気" etc)
-    city = ""
-    for c in CITY_CHIPS:
-        if c in msg:
-            city = c
-            break
-
     # If still empty, remove keyword and treat remaining as city
     if not city:
-        city = msg.replace(key, "")
-        city = city.replace("今日の", "").replace("今日", "")
-        city = city.replace("の", "")
-        city = city.strip()
+        city = _CITY_FILLER_RE.sub("", msg.replace(key, "")).strip()
 
     if not city:
         city = "東京"
@@ -147,7 +282,7 @@ def parse_command(raw: str) -> Tuple[str, str, str]:
 
     return (intent, city, mode)
 
-def ow_geo(city: str) -> Optional[Tuple[str, float, float, str]]:
+async def ow_geo(city: str) -> Optional[Tuple[str, float, float, str]]:
     """
     Resolve city -> (resolved_name, lat, lon, country/region)
     Uses OpenWeather Geocoding API.
@@ -155,17 +290,18 @@ def ow_geo(city: str) -> Optional[Tuple[str, float, float, str]]:
     if not OWM_KEY:
         return None
 
-    query = CITY_ALIASES.get(city, city)
+    key = CITY_ALIASES.get(city, city)
+    if key in GEO_CACHE:
+        return GEO_CACHE[key]
+
+    query = key
     # If already includes country, keep; else add JP to reduce ambiguity
     if "," not in query:
         query = f"{query},JP"
 
     url = "https://api.openweathermap.org/geo/1.0/direct"
     params = {"q": query, "limit": 5, "appid": OWM_KEY}
-    r = requests.get(url, params=params, timeout=10)
-    if r.status_code != 200:
-        return None
-    arr = r.json()
+    arr = await _get_json(url, params)
     if not arr:
         return None
 
@@ -176,37 +312,45 @@ def ow_geo(city: str) -> Optional[Tuple[str, float, float, str]]:
     country = best.get("country") or ""
     state = best.get("state") or ""
     region = state if state else country
-    return (name, float(lat), float(lon), region)
-
-def ow_current(lat: float, lon: float) -> Optional[dict]:
-    if not OWM_KEY:
-        return None
-    url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {"lat": lat, "lon": lon, "units": "metric", "lang": "ja", "appid": OWM_KEY}
-    r = requests.get(url, params=params, timeout=10)
-    if r.status_code != 200:
-        return None
-    return r.json()
-
-def ow_forecast(lat: float, lon: float) -> Optional[dict]:
+    GEO_CACHE[key] = (name, float(lat), float(lon), region)
+    return GEO_CACHE[key]
+
+@app.before_serving
+async def _prewarm_geo():
+    # resolve the UI chips once in the background so chip taps skip geocoding
+    async def warm():
+        for c in CITY_CHIPS:
+            try:
+                await ow_geo(c)
+            except Exception:
+                pass
+    if OWM_KEY:
+        app.add_background_task(warm)
+
+async def ow_onecall(lat: float, lon: float) -> Optional[dict]:
+    """
+    Current weather + daily forecast in one request (One Call API 3.0).
+    Returns {"current": {...}, "daily": [...]}.
+    """
     if not OWM_KEY:
         return None
-    url = "https://api.openweathermap.org/data/2.5/forecast"
-    params = {"lat": lat, "lon": lon, "units": "metric", "lang": "ja", "appid": OWM_KEY}
-    r = requests.get(url, params=params, timeout=10)
-    if r.status_code != 200:
-        return None
-    return r.json()
+    url = "https://api.openweathermap.org/data/3.0/onecall"
+    params = {
+        "lat": lat, "lon": lon, "units": "metric", "lang": "ja",
+        # only current/daily are used; skip the rest to keep the body small
+        "exclude": "minutely,hourly,alerts", "appid": OWM_KEY,
+    }
+    key = ("onecall", round(lat, 3), round(lon, 3))
+    return await _cached(ONECALL_CACHE, key, lambda: _get_json(url, params))
 
 def format_today(city_label: str, region: str, w: dict, sender: str) -> str:
+    # w = One Call "current" block (flat: temp, feels_like, humidity, wind_speed, weather)
     weather = (w.get("weather") or [{}])[0]
     desc = weather.get("description", "不明")
-    main = w.get("main") or {}
-    wind = w.get("wind") or {}
-    temp = main.get("temp")
-    feels = main.get("feels_like")
-    hum = main.get("humidity")
-    ws = wind.get("speed")
+    temp = w.get("temp")
+    feels = w.get("feels_like")
+    hum = w.get("humidity")
+    ws = w.get("wind_speed")
 
     lines = [
         f"【天気】 {city_label} ({region}) (from={sender})",
@@ -217,36 +361,18 @@ def format_today(city_label: str, region: str, w: dict, sender: str) -> str:
     ]
     return "\n".join(lines)
 
-def summarize_5day(fc: dict) -> List[str]:
-    # OpenWeather 3-hour list -> group by date and compute min/max + emoji from noon slot
-    items = fc.get("list") or []
-    by_date: Dict[str, List[dict]] = {}
-    for it in items:
-        dt = it.get("dt")
+def summarize_5day(oc: dict) -> List[str]:
+    # One Call daily[] already has min/max + one representative weather per day
+    out = []
+    for day in (oc.get("daily") or [])[:5]:
+        dt = day.get("dt")
         if not dt:
             continue
         d = datetime.fromtimestamp(dt).strftime("%m/%d")
-        by_date.setdefault(d, []).append(it)
-
-    out = []
-    for d, arr in list(by_date.items())[:5]:
-        temps = [x.get("main", {}).get("temp") for x in arr if isinstance(x.get("main", {}).get("temp"), (int, float))]
-        tmin = min(temps) if temps else None
-        tmax = max(temps) if temps else None
-
-        # pick one representative weather (closest to 12:00)
-        rep = None
-        bestdiff = 999999
-        for x in arr:
-            dt = x.get("dt")
-            if not dt:
-                continue
-            hour = int(datetime.fromtimestamp(dt).strftime("%H"))
-            diff = abs(hour - 12)
-            if diff < bestdiff:
-                bestdiff = diff
-                rep = x
-        desc = ((rep or {}).get("weather") or [{}])[0].get("main", "")
+        temp = day.get("temp") or {}
+        tmin = temp.get("min")
+        tmax = temp.get("max")
+        desc = (day.get("weather") or [{}])[0].get("main", "")
         emoji = "☀️"
         if "Rain" in desc:
             emoji = "🌧️"
@@ -255,7 +381,7 @@ def summarize_5day(fc: dict) -> List[str]:
         elif "Cloud" in desc:
             emoji = "☁️"
 
-        if tmin is not None and tmax is not None:
+        if isinstance(tmin, (int, float)) and isinstance(tmax, (int, float)):
             out.append(f"・{d} {emoji} {tmin:.1f}℃ / {tmax:.1f}℃")
         else:
             out.append(f"・{d} {emoji}")
@@ -266,14 +392,13 @@ def umbrella_advice(w: dict) -> str:
     weather = (w.get("weather") or [{}])[0]
     main = weather.get("main", "")
     pop = None
-    if "rain" in (w.get("rain") or {}):
+    if w.get("rain"):  # current rain volume ({"1h": mm}) is present
         pop = 1.0
     need = ("Rain" in main) or ("Drizzle" in main) or (pop == 1.0)
     return "傘：必要（雨）" if need else "傘：念のため（今後数日で雨/雪の可能性あり）"
 
 def cold_advice(w: dict) -> str:
-    main = w.get("main") or {}
-    feels = main.get("feels_like")
+    feels = w.get("feels_like")
     if not isinstance(feels, (int, float)):
         return "寒さ：不明"
     if feels <= 0:
@@ -287,8 +412,7 @@ def cold_advice(w: dict) -> str:
     return "寒さ：快適"
 
 def outfit_advice(w: dict) -> str:
-    main = w.get("main") or {}
-    feels = main.get("feels_like")
+    feels = w.get("feels_like")
     if not isinstance(feels, (int, float)):
         return "服装：不明"
     if feels <= 5:
@@ -304,57 +428,76 @@ def outfit_advice(w: dict) -> str:
 # ----------------------------
 # API Routes
 # ----------------------------
+# gzip the webhook's own JSON replies (reply_text is UTF-8 Japanese; small bodies
+# aren't worth it). Static files (e.g. manifest.json) are left to Quart / nginx.
+COMPRESS_MIN_SIZE = 512
+COMPRESS_LEVEL = 6
+
+def _accepts(encoding: str) -> bool:
+    return request.accept_encodings.quality(encoding) > 0
+
+def json_response(obj, status: int = 200) -> Response:
+    body = orjson.dumps(obj)
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= COMPRESS_MIN_SIZE and _accepts("gzip"):
+        body = gzip.compress(body, COMPRESS_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, status=status, mimetype="application/json", headers=headers)
+
 @app.get("/ping")
-def ping():
+async def ping():
     return "pong\n"
 
 @app.post("/webhook")
-def webhook():
+async def webhook():
     # Always return JSON (avoid HTML error pages -> UI JSON parse error)
     try:
-        data = request.get_json(silent=True) or {}
+        try:
+            data = orjson.loads(await request.get_data()) or {}
+        except orjson.JSONDecodeError:
+            data = {}
         sender = str(data.get("from") or "unknown")
         msg = str(data.get("message") or "").strip()
 
         intent, city, mode = parse_command(msg)
         # debug log
-        print(f"[webhook] from={sender} raw={msg!r} intent={intent} city={city!r} mode={mode}")
+        log.info("from=%s raw=%r intent=%s city=%r mode=%s", sender, msg, intent, city, mode)
 
         if intent == "raw":
             reply_text = f"[from={sender}] {msg}"
-            sent = post_to_discord(reply_text)
-            return jsonify({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": city, "reply_text": reply_text})
+            sent = queue_discord(reply_text)
+            return json_response({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": city, "reply_text": reply_text})
 
-        geo = ow_geo(city)
+        geo = await ow_geo(city)
         if not geo:
             reply_text = f"場所「{city}」が見つかりませんでした (from={sender})"
-            sent = post_to_discord(reply_text)
-            return jsonify({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": city, "reply_text": reply_text})
+            sent = queue_discord(reply_text)
+            return json_response({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": city, "reply_text": reply_text})
 
         resolved_name, lat, lon, region = geo
 
-        w = ow_current(lat, lon)
+        # one request covers every intent: current for today/advice, daily for forecast
+        oc = await ow_onecall(lat, lon)
+        w = (oc or {}).get("current")
         if not w:
             reply_text = f"天気取得に失敗しました（{resolved_name}） (from={sender})"
-            sent = post_to_discord(reply_text)
-            return jsonify({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": resolved_name, "reply_text": reply_text})
+            sent = queue_discord(reply_text)
+            return json_response({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": resolved_name, "reply_text": reply_text})
 
         if intent == "weather":
             reply_text = format_today(resolved_name, region or "JP", w, sender)
-            sent = post_to_discord(reply_text)
-            return jsonify({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": resolved_name, "reply_text": reply_text})
+            sent = queue_discord(reply_text)
+            return json_response({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": resolved_name, "reply_text": reply_text})
 
         if intent == "forecast":
-            fc = ow_forecast(lat, lon)
-            if not fc:
+            if not oc.get("daily"):
                 reply_text = f"週間天気取得に失敗しました（{resolved_name}） (from={sender})"
             else:
                 lines = [f"【週間天気】 {resolved_name} ({region or 'JP'}) (from={sender})（今後5日）"]
-                lines += summarize_5day(fc)
-                lines.append("※ OpenWeather無料枠は5日予報が基本です（7日相当はプラン制限のことがあります）")
+                lines += summarize_5day(oc)
                 reply_text = "\n".join(lines)
-            sent = post_to_discord(reply_text)
-            return jsonify({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": resolved_name, "reply_text": reply_text})
+            sent = queue_discord(reply_text)
+            return json_response({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": resolved_name, "reply_text": reply_text})
 
         if intent in ("umbrella", "cold", "outfit"):
             base = format_today(resolved_name, region or "JP", w, sender)
@@ -366,17 +509,17 @@ def webhook():
             elif intent == "outfit":
                 extra.append(outfit_advice(w))
             reply_text = base + "\n・" + "\n・".join(extra)
-            sent = post_to_discord(reply_text)
-            return jsonify({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": resolved_name, "reply_text": reply_text})
+            sent = queue_discord(reply_text)
+            return json_response({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": resolved_name, "reply_text": reply_text})
 
         # fallback
         reply_text = f"[from={sender}] {msg}"
-        sent = post_to_discord(reply_text)
-        return jsonify({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": city, "reply_text": reply_text})
+        sent = queue_discord(reply_text)
+        return json_response({"status": "ok", "sent_to_discord": sent, "mode": mode, "city": city, "reply_text": reply_text})
 
     except Exception as e:
         # Return JSON error (so UI can show it safely)
-        return jsonify({"status": "error", "error": str(e)}), 500
+        return json_response({"status": "error", "error": str(e)}, 500)
 
 # ----------------------------
 # UI (single-file HTML)
@@ -719,7 +862,7 @@ async function postWebhook(message){
 
     resultEl.textContent = data.reply_text || JSON.stringify(data, null, 2);
     statusEl.className = "status ok";
-    statusEl.textContent = "成功：UIに表示 + Discordにも投稿済み";
+    statusEl.textContent = data.sent_to_discord ? "成功：UIに表示 + Discordへ投稿" : "成功：UIに表示";
   }catch(e){
     const msg = (e && e.name === "AbortError") ? "タイムアウトしました（12秒）" : String(e);
     resultEl.textContent = "ERROR: " + msg;
@@ -803,19 +946,48 @@ window.addEventListener('offline', () => setNetBanner(true));
 </html>
 """
 
+# CITY_CHIPS is fixed, so render the page once at import time
+UI_HTML_RENDERED = UI_HTML.replace("%CITY_JSON%", orjson.dumps(CITY_CHIPS).decode("utf-8")).encode("utf-8")
+UI_ETAG = hashlib.blake2b(UI_HTML_RENDERED, digest_size=16).hexdigest()
+UI_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+
+# ... and compress it once too: (Content-Encoding, body, ETag), in order of preference
+UI_VARIANTS: List[Tuple[str, bytes, str]] = []
+if brotli is not None:
+    UI_VARIANTS.append(("br", brotli.compress(UI_HTML_RENDERED, quality=11), UI_ETAG + "-br"))
+UI_VARIANTS.append(("gzip", gzip.compress(UI_HTML_RENDERED, 9), UI_ETAG + "-gzip"))
+
 @app.get("/ui")
-def ui():
-    html = UI_HTML.replace("%CITY_JSON%", json.dumps(CITY_CHIPS, ensure_ascii=False))
-    return Response(html, mimetype="text/html; charset=utf-8")
+async def ui():
+    headers = {"Cache-Control": UI_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    body, etag = UI_HTML_RENDERED, UI_ETAG
+    for encoding, data, variant_etag in UI_VARIANTS:
+        if _accepts(encoding):
+            body, etag = data, variant_etag
+            headers["Content-Encoding"] = encoding
+            break
+    headers["ETag"] = f'"{etag}"'
+    # revalidation from the browser / service worker: unchanged page -> no body
+    if request.if_none_match.contains_weak(etag):
+        headers.pop("Content-Encoding", None)
+        return Response(b"", status=304, headers=headers)
+    return Response(body, mimetype="text/html; charset=utf-8", headers=headers)
 
 # ----------------------------
 # Static files for PWA
 # ----------------------------
-@app.get("/static/<path:filename>")
-def static_files(filename: str):
-    # expects you created ./static next to this script
-    base = os.path.join(os.path.dirname(__file__), "static")
-    return send_from_directory(base, filename)
+# Served by Quart's static route (see app = Quart(...)), which already sends
+# ETag/Last-Modified and answers conditional requests with 304. In production put
+# nginx in front for /static/ (sendfile) so these never reach Python. See README.
+
+# PWA entry points must be revalidated, or app updates would stick for a year
+NO_CACHE_STATIC = ("/static/sw.js", "/static/manifest.json")
+
+@app.after_request
+async def _static_cache(resp):
+    if request.path in NO_CACHE_STATIC:
+        resp.headers["Cache-Control"] = "no-cache"
+    return resp
 
 # ----------------------------
 # Main
@@ -823,4 +995,5 @@ def static_files(filename: str):
 if __name__ == "__main__":
     if not OWM_KEY:
         print("[WARN] OPENWEATHER_API_KEY is not set. Weather features will fail.")
+    # single-process dev server; for production run under hypercorn (see README)
     app.run(host="0.0.0.0", port=PORT, debug=False)
\ No newline at end of file